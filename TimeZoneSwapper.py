@@ -32,93 +32,133 @@ Important:
 
 from __future__ import annotations
 
+import functools
 import re
 import sys
 import time as _time
-from datetime import datetime, date, time, timedelta
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from datetime import datetime, date, timedelta
+from typing import TYPE_CHECKING
 
 import ctypes
 from ctypes import wintypes
 
+if TYPE_CHECKING:
+    from zoneinfo import ZoneInfo
+
 # ----------------------------
 # Time zones
 # ----------------------------
-ET = ZoneInfo("America/New_York")
-AWST = ZoneInfo("Australia/Perth")
+# Zones are resolved lazily: importing zoneinfo and building a ZoneInfo
+# (which reads tzdata) is skipped entirely on the "clipboard empty" /
+# "could not parse" paths.
+ET_KEY = "America/New_York"
+AWST_KEY = "Australia/Perth"
+
+
+@functools.lru_cache(maxsize=None)
+def _zone(key: str) -> ZoneInfo:
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(key)
+
 
 ET_MARKERS = re.compile(r"\b(Eastern|ET|EST|EDT|America/New_York)\b", re.IGNORECASE)
 AWST_MARKERS = re.compile(r"\b(AWST|Perth|Australia/Perth)\b", re.IGNORECASE)
+# Cheap lowercase substring prefilters for the marker regexes. A hit here is
+# only a candidate ("et" also occurs in "meet"), so the regex still decides on
+# word boundaries; a miss lets parse_input skip the regex entirely.
+ET_TOKENS = ("et", "est", "edt", "eastern", "america/new_york")
+AWST_TOKENS = ("awst", "perth")
 
 # ----------------------------
 # Parsing regex
 # ----------------------------
-TIME_RE = re.compile(r"(?P<h>\d{1,2})(?::(?P<m>\d{2}))?\s*(?P<ampm>am|pm|AM|PM)?")
-ISO_DATE_RE = re.compile(r"(?P<iso>\d{4}-\d{2}-\d{2})")
-MONTHDAY_RE = re.compile(r"(?P<mon>[A-Za-z]{3,9})\.?\s*(?P<day>\d{1,2})")
-RELATIVE_RE = re.compile(r"\b(today|tomorrow|yesterday)\b", re.IGNORECASE)
-WEEKDAY_RE = re.compile(
-    r"\b(?:(this|next)\s+)?(mon|monday|tue|tues|tuesday|wed|wednesday|thu|thur|thurs|thursday|fri|friday|sat|saturday|sun|sunday)\b",
+_TIME_PATTERN = r"(?P<h>\d{1,2})(?::(?P<m>\d{2}))?\s*(?P<ampm>am|pm)?"
+
+# Fast path for the common case where the whole text is just a time.
+TIME_RE = re.compile(_TIME_PATTERN, re.IGNORECASE)
+
+# One alternation covering every token parse_input cares about, so the input is
+# scanned a single time with finditer. Each alternative's outer group name is
+# what match.lastgroup reports, which parse_input uses to dispatch.
+# The month-day day must not run into a longer number or a time ("May 2026-...",
+# "dec 3pm", "Mar 4:30"), otherwise its leftmost match would steal those digits.
+MASTER_RE = re.compile(
+    r"(?P<iso>\d{4}-\d{2}-\d{2})"
+    r"|(?P<monthday>\b(?P<mon>(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]{0,6})\.?\s*(?P<day>\d{1,2})(?![\d:]|\s*[ap]m\b))"
+    r"|\b(?P<rel>today|tomorrow|yesterday)\b"
+    r"|\b(?:(?P<when>this|next)\s+)?(?P<wd>mon|monday|tue|tues|tuesday|wed|wednesday|thu|thur|thurs|thursday|fri|friday|sat|saturday|sun|sunday)\b"
+    r"|(?P<time>" + _TIME_PATTERN + r")",
     re.IGNORECASE,
 )
 
-WEEKDAY_MAP = {
-    "mon": 0,
-    "monday": 0,
-    "tue": 1,
-    "tues": 1,
-    "tuesday": 1,
-    "wed": 2,
-    "wednesday": 2,
-    "thu": 3,
-    "thur": 3,
-    "thurs": 3,
-    "thursday": 3,
-    "fri": 4,
-    "friday": 4,
-    "sat": 5,
-    "saturday": 5,
-    "sun": 6,
-    "sunday": 6,
+MONTH_MAP = {
+    m: i
+    for i, m in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1
+    )
 }
 
+# Keyed by the three-letter prefix; MASTER_RE only lets real weekday names
+# through, and every one of them starts with a unique prefix.
+WEEKDAY_MAP = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
 # ----------------------------
 # Win32 clipboard (safe + retry; no PowerShell; no focus steal when using pythonw.exe)
 # ----------------------------
-user32 = ctypes.WinDLL("user32", use_last_error=True)
-kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-
 CF_UNICODETEXT = 13
 GMEM_MOVEABLE = 0x0002
 
-user32.OpenClipboard.argtypes = [wintypes.HWND]
-user32.OpenClipboard.restype = wintypes.BOOL
-user32.CloseClipboard.argtypes = []
-user32.CloseClipboard.restype = wintypes.BOOL
-user32.EmptyClipboard.argtypes = []
-user32.EmptyClipboard.restype = wintypes.BOOL
-user32.GetClipboardData.argtypes = [wintypes.UINT]
-user32.GetClipboardData.restype = wintypes.HANDLE
-user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
-user32.SetClipboardData.restype = wintypes.HANDLE
-
-kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
-kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
-kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
-kernel32.GlobalLock.restype = wintypes.LPVOID
-kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
-kernel32.GlobalUnlock.restype = wintypes.BOOL
-
-
-def _open_clipboard_with_retry(retries: int = 30, delay_s: float = 0.01) -> bool:
+# Loaded on first clipboard access by _init_win32(), not at import time.
+user32 = None
+kernel32 = None
+_WIN32_READY = False
+
+
+def _init_win32() -> None:
+    global user32, kernel32, _WIN32_READY
+    if _WIN32_READY:
+        return
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    user32.OpenClipboard.argtypes = [wintypes.HWND]
+    user32.OpenClipboard.restype = wintypes.BOOL
+    user32.CloseClipboard.argtypes = []
+    user32.CloseClipboard.restype = wintypes.BOOL
+    user32.EmptyClipboard.argtypes = []
+    user32.EmptyClipboard.restype = wintypes.BOOL
+    user32.GetClipboardData.argtypes = [wintypes.UINT]
+    user32.GetClipboardData.restype = wintypes.HANDLE
+    user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    user32.SetClipboardData.restype = wintypes.HANDLE
+
+    kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalLock.restype = wintypes.LPVOID
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalUnlock.restype = wintypes.BOOL
+    kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.restype = wintypes.HGLOBAL
+
+    _WIN32_READY = True
+
+
+def _open_clipboard_with_retry(retries: int = 20, delay_s: float = 0.0005, max_delay_s: float = 0.02) -> bool:
+    # Exponential backoff: brief contention clears after a sub-ms sleep, while
+    # the worst case still waits roughly 0.3s in total, as before.
     for _ in range(retries):
         if user32.OpenClipboard(None):
             return True
         _time.sleep(delay_s)
+        delay_s = min(delay_s * 2, max_delay_s)
     return False
 
 
 def read_clipboard_windows() -> str:
+    _init_win32()
     if not _open_clipboard_with_retry():
         return ""
     try:
@@ -129,7 +169,11 @@ def read_clipboard_windows() -> str:
         if not p:
             return ""
         try:
-            return ctypes.wstring_at(p).strip()
+            # strip() only runs when there is leading/trailing whitespace to remove
+            text = ctypes.wstring_at(p)
+            if text and (text[0].isspace() or text[-1].isspace()):
+                text = text.strip()
+            return text
         finally:
             kernel32.GlobalUnlock(h)
     finally:
@@ -142,6 +186,7 @@ def write_clipboard_windows(text: str) -> None:
     if not isinstance(text, str):
         text = str(text)
 
+    _init_win32()
     if not _open_clipboard_with_retry():
         return
 
@@ -149,8 +194,10 @@ def write_clipboard_windows(text: str) -> None:
         if not user32.EmptyClipboard():
             return
 
-        data = text + "\0"
-        size_bytes = len(data) * ctypes.sizeof(wintypes.WCHAR)
+        # Size from the UTF-16 encoding, not len(text): characters outside the
+        # BMP (e.g. emoji) take two wchar_t units, and the NUL must fit too.
+        data = (text + "\0").encode("utf-16-le")
+        size_bytes = len(data)
 
         hglob = kernel32.GlobalAlloc(GMEM_MOVEABLE, size_bytes)
         if not hglob:
@@ -158,15 +205,18 @@ def write_clipboard_windows(text: str) -> None:
 
         p = kernel32.GlobalLock(hglob)
         if not p:
+            kernel32.GlobalFree(hglob)
             return
 
         try:
-            ctypes.memmove(p, ctypes.create_unicode_buffer(data), size_bytes)
+            ctypes.memmove(p, data, size_bytes)
         finally:
             kernel32.GlobalUnlock(hglob)
 
-        # If SetClipboardData succeeds, Windows owns the memory handle.
+        # If SetClipboardData succeeds, Windows owns the memory handle;
+        # otherwise it is still ours to free.
         if not user32.SetClipboardData(CF_UNICODETEXT, hglob):
+            kernel32.GlobalFree(hglob)
             return
 
     finally:
@@ -183,16 +233,19 @@ def next_weekday(reference: date, target_wd: int, when: str | None) -> date:
       - 'this' or None => nearest occurrence including today
     """
     ref_wd = reference.weekday()
-    days_ahead = (target_wd - ref_wd) % 7
     if when == "next":
-        days_ahead = days_ahead if days_ahead != 0 else 7
+        # 1..7: a same-weekday match rolls over to next week
+        days_ahead = (target_wd - ref_wd - 1) % 7 + 1
+    else:
+        days_ahead = (target_wd - ref_wd) % 7
     return reference + timedelta(days=days_ahead)
 
 
-def parse_input(raw: str):
+def parse_input(raw: str) -> datetime | None:
     """
-    Returns (dt_naive, src_zone_hint) where src_zone_hint is ET/AWST or None.
-    dt_naive has no tzinfo; tz assignment happens later.
+    Returns the parsed datetime, or None if no time was found.
+    If the text carried an ET/AWST marker, the result already has that zone as
+    tzinfo; otherwise it is naive and the zone is decided later.
     """
     if raw is None:
         return None
@@ -200,73 +253,75 @@ def parse_input(raw: str):
     if not s:
         return None
 
-    # timezone hint from markers
+    # timezone hint from markers; subn strips them and reports whether any
+    # were present in a single pass
     src_zone = None
-    if ET_MARKERS.search(s):
-        src_zone = ET
-        s = ET_MARKERS.sub("", s)
-    elif AWST_MARKERS.search(s):
-        src_zone = AWST
-        s = AWST_MARKERS.sub("", s)
-
-    s = " ".join(s.split())
+    sl = s.lower()
+    if any(t in sl for t in ET_TOKENS):
+        cleaned, n = ET_MARKERS.subn("", s)
+        if n:
+            src_zone = ET_KEY
+            s = cleaned
+    if src_zone is None and any(t in sl for t in AWST_TOKENS):
+        cleaned, n = AWST_MARKERS.subn("", s)
+        if n:
+            src_zone = AWST_KEY
+            s = cleaned
+
+    # fast path: a bare time ("3:30 PM", "15:30", "3pm") has no date tokens,
+    # so skip the full scan; otherwise make a single pass keeping the first
+    # match of each kind, in input order
+    found = {}
+    m_time = TIME_RE.fullmatch(s.strip())
+    if not m_time:
+        for m in MASTER_RE.finditer(s):
+            found.setdefault(m.lastgroup, m)
+        m_time = found.get("time")
+        if not m_time:
+            # no time => can't parse
+            return None
 
     # date parsing
     parsed_date = None
+    today = date.today()
 
-    m_iso = ISO_DATE_RE.search(s)
+    m_iso = found.get("iso")
     if m_iso:
         parsed_date = datetime.fromisoformat(m_iso.group("iso")).date()
-        s = s.replace(m_iso.group("iso"), "").strip()
 
     if not parsed_date:
-        m_md = MONTHDAY_RE.search(s)
+        m_md = found.get("monthday")
         if m_md:
-            try:
-                mon = m_md.group("mon")[:3]
-                day = int(m_md.group("day"))
-                mon_num = datetime.strptime(mon, "%b").month
-                parsed_date = date(date.today().year, mon_num, day)
-                s = s.replace(m_md.group(0), "").strip()
-            except Exception:
-                parsed_date = None
+            mon_num = MONTH_MAP.get(m_md.group("mon")[:3].lower())
+            if mon_num is not None:
+                try:
+                    parsed_date = date(today.year, mon_num, int(m_md.group("day")))
+                except ValueError:
+                    # e.g. "Feb 30"
+                    parsed_date = None
 
     if not parsed_date:
-        m_rel = RELATIVE_RE.search(s)
+        m_rel = found.get("rel")
         if m_rel:
-            kw = m_rel.group(1).lower()
-            today = date.today()
+            kw = m_rel.group("rel").lower()
             if kw == "today":
                 parsed_date = today
             elif kw == "tomorrow":
                 parsed_date = today + timedelta(days=1)
             else:
                 parsed_date = today - timedelta(days=1)
-            s = s.replace(m_rel.group(0), "").strip()
 
     if not parsed_date:
-        m_wd = WEEKDAY_RE.search(s)
+        m_wd = found.get("wd")
         if m_wd:
-            when = m_wd.group(1).lower() if m_wd.group(1) else None
-            wd_token = m_wd.group(2).lower()
-            wd_key = None
-            for k in WEEKDAY_MAP.keys():
-                if wd_token.startswith(k):
-                    wd_key = k
-                    break
-            if wd_key:
-                parsed_date = next_weekday(date.today(), WEEKDAY_MAP[wd_key], when)
-                s = s.replace(m_wd.group(0), "").strip()
+            when = m_wd.group("when").lower() if m_wd.group("when") else None
+            wd_num = WEEKDAY_MAP[m_wd.group("wd")[:3].lower()]
+            parsed_date = next_weekday(today, wd_num, when)
 
     # time parsing
-    m_time = TIME_RE.search(s)
-    if not m_time:
-        # no time => can't parse
-        return None
-
-    hour = int(m_time.group("h"))
-    minute = int(m_time.group("m")) if m_time.group("m") else 0
-    ampm = m_time.group("ampm")
+    hour, mm, ampm = m_time.group("h", "m", "ampm")
+    hour = int(hour)
+    minute = int(mm) if mm else 0
     if ampm:
         am = ampm.lower()
         if am == "pm" and hour < 12:
@@ -275,49 +330,56 @@ def parse_input(raw: str):
             hour = 0
 
     if not parsed_date:
-        parsed_date = date.today()
+        parsed_date = today
+
+    tz = _zone(src_zone) if src_zone else None
+    return datetime(parsed_date.year, parsed_date.month, parsed_date.day, hour, minute, tzinfo=tz)
 
-    dt_naive = datetime.combine(parsed_date, time(hour, minute))
-    return dt_naive, src_zone
+
+@functools.lru_cache(maxsize=1)
+def _local_zone_guess() -> str:
+    """
+    Zone key for the machine's local tz (ET_KEY or AWST_KEY); defaults to ET.
+    Constant for the life of the process, so it is computed once.
+    """
+    local_tz = datetime.now().astimezone().tzinfo
+    name = getattr(local_tz, "key", None) or getattr(local_tz, "zone", None) or str(local_tz)
+    name = str(name)
+    if "New_York" in name or "America/New_York" in name or "Eastern" in name:
+        return ET_KEY
+    if "Perth" in name or "Australia/Perth" in name or "AWST" in name:
+        return AWST_KEY
+    return ET_KEY
 
 
-def determine_source_and_target(dt_naive: datetime, src_zone_hint: ZoneInfo | None):
+def determine_source_and_target(dt: datetime):
     """
+    dt is parse_input's result: aware if the text named a zone, else naive.
     Returns: (dt_source_with_tz, source_zone, target_zone)
     """
-    if src_zone_hint is not None:
-        source = src_zone_hint
+    if dt.tzinfo is not None:
+        source = dt.tzinfo
     else:
         # try infer from local tz; default to ET
-        local_tz = datetime.now().astimezone().tzinfo
-        name = getattr(local_tz, "key", None) or getattr(local_tz, "zone", None) or str(local_tz)
-        name = str(name)
-        if "New_York" in name or "America/New_York" in name or "Eastern" in name:
-            source = ET
-        elif "Perth" in name or "Australia/Perth" in name or "AWST" in name:
-            source = AWST
-        else:
-            source = ET
+        source = _zone(_local_zone_guess())
+        dt = dt.replace(tzinfo=source)
 
-    target = AWST if source is ET else ET
-    dt_source = dt_naive.replace(tzinfo=source)
-    return dt_source, source, target
+    # target is always the other zone, so the caller's astimezone() is never a no-op
+    target = _zone(AWST_KEY if source.key == ET_KEY else ET_KEY)
+    return dt, source, target
 
 
-def tz_label_for(zone: ZoneInfo) -> str:
-    return "AWST" if zone is AWST else "ET"
+DAY_ABBR = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTH_ABBR = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
 
 
 def format_short_core(dt: datetime, tz_label: str) -> str:
     # "2:00am Fri Feb 13 AWST"
-    # Windows strftime doesn't reliably support %-I / %-d; handle both.
-    try:
-        t = dt.strftime("%-I:%M%p")
-        d = dt.strftime("%a %b %-d")
-    except Exception:
-        t = dt.strftime("%I:%M%p").lstrip("0")
-        d = dt.strftime("%a %b %d").replace(" 0", " ")
-    return f"{t.lower()} {d} {tz_label}"
+    # Built from the datetime fields directly: Windows strftime lacks %-I / %-d,
+    # and this also sidesteps strftime's locale handling.
+    h12 = dt.hour % 12 or 12
+    ampm = "am" if dt.hour < 12 else "pm"
+    return f"{h12}:{dt.minute:02d}{ampm} {DAY_ABBR[dt.weekday()]} {MONTH_ABBR[dt.month]} {dt.day} {tz_label}"
 
 
 def main():
@@ -331,21 +393,27 @@ def main():
         write_clipboard_windows("[tz] clipboard empty (copy a time first)")
         return
 
-    parsed = parse_input(raw)
-    if not parsed:
-        write_clipboard_windows("[tz] could not parse (try 'next tuesday 3pm', '3:30 PM', or include 'ET'/'Perth')")
-        return
-
-    dt_naive, src_hint = parsed
-
     try:
-        dt_source, src_zone, tgt_zone = determine_source_and_target(dt_naive, src_hint)
+        # parse_input resolves the zone named in the text (if any), so it can
+        # raise ZoneInfoNotFoundError too; a failed parse never touches tzdata
+        dt = parse_input(raw)
+        if dt is None:
+            write_clipboard_windows("[tz] could not parse (try 'next tuesday 3pm', '3:30 PM', or include 'ET'/'Perth')")
+            return
+
+        dt_source, src_zone, tgt_zone = determine_source_and_target(dt)
         dt_target = dt_source.astimezone(tgt_zone)
-    except ZoneInfoNotFoundError:
+    except KeyError as e:
+        # ZoneInfoNotFoundError is a KeyError; zoneinfo is only imported once a
+        # zone has actually been requested, so check for it here
+        from zoneinfo import ZoneInfoNotFoundError
+
+        if not isinstance(e, ZoneInfoNotFoundError):
+            raise
         write_clipboard_windows("[tz] missing tzdata. Run: python -m pip install --user tzdata")
         return
 
-    converted = format_short_core(dt_target, tz_label_for(tgt_zone))
+    converted = format_short_core(dt_target, "AWST" if tgt_zone.key == AWST_KEY else "ET")
     out = f"{raw.strip()} ({converted})"
     write_clipboard_windows(out)
 